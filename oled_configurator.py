@@ -1,9 +1,13 @@
 import tkinter as tk
+from collections import deque
+from dataclasses import dataclass, field
 from tkinter import ttk, filedialog, messagebox
 from PIL import Image, ImageTk, ImageDraw, ImageFont
 import os
 import json
 import hid
+import struct
+import threading
 import time
 import sys
 
@@ -11,16 +15,46 @@ LILY58_VENDOR_ID = 0x04D8
 LILY58_PRODUCT_ID = 0xEB2D
 VIA_PROTOCOL_VERSION = 0x0C  # VIA protocol version
 
+# QMK raw HID interface descriptor values
+RAW_HID_USAGE_PAGE = 0xFF60
+RAW_HID_USAGE = 0x61
+
 # VIA protocol commands
 VIA_COMMAND_START = 0x00
 VIA_COMMAND_OLED = 0x40  # Custom command for OLED
 VIA_COMMAND_GET_PROTOCOL_VERSION = 0x01
 VIA_COMMAND_GET_KEYBOARD_VALUE = 0x02
 
+# Set True for verbose console logging. Call sites guard with `if DEBUG:`
+# so the message formatting is skipped entirely in normal use.
+DEBUG = False
+
 def debug_print(msg):
     """Print debug messages to console."""
     print(f"DEBUG: {msg}")
 
+@dataclass(slots=True)
+class SideState:
+    """Widget and image state for one OLED side."""
+    # Text mode
+    text_var: tk.StringVar = None
+    text_x: ttk.Entry = None
+    text_y: ttk.Entry = None
+    text_rotation: tk.IntVar = None
+    text_preview: tk.Canvas = None
+    text_buf: Image.Image = None
+    text_draw: ImageDraw.ImageDraw = None
+    text_photo: ImageTk.PhotoImage = None
+    text_cache_key: tuple = None
+    current_text_image: Image.Image = None
+    # Image mode
+    image_rotation: tk.IntVar = None
+    image_preview: tk.Canvas = None
+    image_photo: ImageTk.PhotoImage = None
+    source_image: Image.Image = None
+    current_image: Image.Image = None
+    rot_cache: dict = field(default_factory=dict)
+
 class OLED_Configurator:
     def __init__(self, root):
         self.root = root
@@ -31,10 +65,28 @@ class OLED_Configurator:
         self.oled_width = 128
         self.oled_height = 32
         self.preview_scale = 2
-        
+
+        # Resolve the bitmap font once instead of per draw call
+        self.text_font = ImageFont.load_default()
+
+        # Per-side widget and image state
+        self.sides = {'left': SideState(), 'right': SideState()}
+
+        # Pending debounced preview callbacks, keyed by side
+        self._preview_pending = {}
+
         # HID device
         self.device = None
-        
+        # HID report geometry; updated from the descriptor on connect
+        self.report_size = 32
+        self.chunk_size = self.report_size - 4  # 4 header bytes per report
+        # Serializes access to the device from send worker threads
+        self.device_lock = threading.Lock()
+        # Apply buttons, disabled while a send is in flight
+        self.apply_buttons = []
+        # Recent hid.enumerate results: (timestamp, device list)
+        self._enum_cache = (0.0, [])
+
         # Configure style
         style = ttk.Style()
         style.configure('TNotebook.Tab', padding=[12, 8])
@@ -77,16 +129,36 @@ class OLED_Configurator:
     
     def connect_hid(self):
         try:
-            debug_print("Searching for Lily58 keyboard...")
-            # Find all HID devices
-            devices = list(hid.enumerate(LILY58_VENDOR_ID, LILY58_PRODUCT_ID))
-            debug_print(f"Found {len(devices)} matching devices")
+            if DEBUG:
+                debug_print("Searching for Lily58 keyboard...")
+            # Enumeration can take 100+ ms on some OSes; reuse a recent
+            # scan across quick reconnect attempts
+            now = time.monotonic()
+            if now - self._enum_cache[0] > 2.0:
+                # Only the raw HID interface answers VIA commands; skip the
+                # keyboard and consumer control interfaces up front
+                self._enum_cache = (now, [
+                    d for d in hid.enumerate(LILY58_VENDOR_ID, LILY58_PRODUCT_ID)
+                    if d.get('usage_page') == RAW_HID_USAGE_PAGE
+                    and d.get('usage') == RAW_HID_USAGE])
+            devices = self._enum_cache[1]
+            if DEBUG:
+                debug_print(f"Found {len(devices)} matching devices")
             
             for device_info in devices:
-                debug_print(f"Attempting to connect to device: {device_info['path']}")
+                if DEBUG:
+                    debug_print(f"Attempting to connect to device: {device_info['path']}")
                 try:
                     self.device = hid.Device(path=device_info['path'])
-                    debug_print("Device opened successfully")
+                    if DEBUG:
+                        debug_print("Device opened successfully")
+
+                    # Use larger reports when the descriptor offers them
+                    # (e.g. 64-byte raw HID); fewer chunks per upload
+                    self.report_size = max(32, int(device_info.get('max_input_report_size', 32)))
+                    self.chunk_size = self.report_size - 4
+                    if DEBUG:
+                        debug_print(f"Report size: {self.report_size}")
                     
                     # Try to get protocol version
                     version = self.get_protocol_version()
@@ -99,10 +171,12 @@ class OLED_Configurator:
                     # Close device if protocol version check failed
                     self.device.close()
                     self.device = None
-                    debug_print("Failed to get protocol version")
+                    if DEBUG:
+                        debug_print("Failed to get protocol version")
                     
                 except Exception as e:
-                    debug_print(f"Failed to open device: {str(e)}")
+                    if DEBUG:
+                        debug_print(f"Failed to open device: {str(e)}")
                     if self.device:
                         self.device.close()
                         self.device = None
@@ -115,7 +189,8 @@ class OLED_Configurator:
             
         except Exception as e:
             self.status_var.set("Connection failed")
-            debug_print(f"Connection error: {str(e)}")
+            if DEBUG:
+                debug_print(f"Connection error: {str(e)}")
             messagebox.showerror("Error", f"Failed to connect: {str(e)}")
             if self.device:
                 self.device.close()
@@ -125,40 +200,46 @@ class OLED_Configurator:
         """Get VIA protocol version from keyboard."""
         try:
             # Standard VIA protocol version request
-            command = [0x00, VIA_COMMAND_GET_PROTOCOL_VERSION] + [0] * 30
-            debug_print(f"Sending VIA protocol version command: {command}")
+            command = [0x00, VIA_COMMAND_GET_PROTOCOL_VERSION] + [0] * (self.report_size - 2)
+            if DEBUG:
+                debug_print(f"Sending VIA protocol version command: {command}")
             self.device.write(bytes(command))
             
             # Read response
             response = self.read_with_timeout()
             if response:
-                debug_print(f"Got response: {list(response)}")
+                if DEBUG:
+                    debug_print(f"Got response: {list(response)}")
                 if len(response) >= 3:
                     version = response[2]  # VIA protocol version is in third byte
-                    debug_print(f"Protocol version: {version}")
+                    if DEBUG:
+                        debug_print(f"Protocol version: {version}")
                     return version
             
-            debug_print("No valid protocol version found")
+            if DEBUG:
+                debug_print("No valid protocol version found")
             return None
             
         except Exception as e:
-            debug_print(f"Error getting protocol version: {str(e)}")
+            if DEBUG:
+                debug_print(f"Error getting protocol version: {str(e)}")
             return None
 
     def read_with_timeout(self, timeout=1.0):
-        """Read HID report with timeout."""
-        start_time = time.time()
-        while (time.time() - start_time) < timeout:
-            try:
-                # Read without timeout parameter
-                response = self.device.read(32)
-                if response:
+        """Read HID report, blocking natively for up to timeout seconds."""
+        try:
+            # hidapi takes the timeout in milliseconds and waits in the
+            # kernel instead of us polling from Python
+            response = self.device.read(self.report_size, int(timeout * 1000))
+            if response:
+                if DEBUG:
                     debug_print(f"Read response: {list(response)}")
-                    return response
-            except Exception as e:
+                return response
+        except Exception as e:
+            if DEBUG:
                 debug_print(f"Read error: {str(e)}")
-            time.sleep(0.01)
-        debug_print("Read timeout")
+        if DEBUG:
+            debug_print("Read timeout")
         return None
 
     def setup_oled_interface(self, parent_frame, oled_side):
@@ -176,17 +257,40 @@ class OLED_Configurator:
         self.setup_text_mode(text_frame, oled_side)
         self.setup_image_mode(image_frame, oled_side)
     
+    def _make_rotation_control(self, parent):
+        """Build a rotation selector and return its IntVar.
+
+        A single readonly Combobox replaces the previous block of eight
+        Radiobuttons, which cost one Tk roundtrip per widget at startup.
+        """
+        var = tk.IntVar(value=0)
+        rot_frame = ttk.LabelFrame(parent, text="Rotation", padding=5)
+        rot_frame.pack(side='left', padx=5)
+
+        combo = ttk.Combobox(rot_frame,
+                             values=[f"{angle}°" for angle in range(0, 360, 45)],
+                             width=5, state='readonly')
+        combo.current(0)
+        combo.bind('<<ComboboxSelected>>',
+                   lambda e: var.set(int(combo.get().rstrip('°'))))
+        combo.pack(side='left', padx=2)
+        return var
+
     def setup_text_mode(self, parent, oled_side):
+        state = self.sides[oled_side]
+
         # Text input frame
         input_frame = ttk.LabelFrame(parent, text="Text Input", padding=10)
         input_frame.pack(fill='x', padx=10, pady=5)
-        
+
         # Text entry
-        text_var = tk.StringVar()
-        setattr(self, f"{oled_side}_text_var", text_var)
+        state.text_var = tk.StringVar()
         ttk.Label(input_frame, text="Enter Text:").pack(anchor='w')
-        text_entry = ttk.Entry(input_frame, textvariable=text_var)
+        text_entry = ttk.Entry(input_frame, textvariable=state.text_var)
         text_entry.pack(fill='x', pady=5)
+        # Live preview: coalesce rapid edits into a single render
+        state.text_var.trace_add('write',
+                                lambda *args: self._schedule_text_preview(oled_side))
         
         # Position and rotation controls
         controls_frame = ttk.Frame(input_frame)
@@ -197,49 +301,56 @@ class OLED_Configurator:
         pos_frame.pack(side='left', padx=5)
         
         ttk.Label(pos_frame, text="X:").pack(side='left')
-        text_x = ttk.Entry(pos_frame, width=5)
-        text_x.pack(side='left', padx=5)
-        text_x.insert(0, "0")
-        setattr(self, f"{oled_side}_text_x", text_x)
-        
+        state.text_x = ttk.Entry(pos_frame, width=5)
+        state.text_x.pack(side='left', padx=5)
+        state.text_x.insert(0, "0")
+
         ttk.Label(pos_frame, text="Y:").pack(side='left')
-        text_y = ttk.Entry(pos_frame, width=5)
-        text_y.pack(side='left', padx=5)
-        text_y.insert(0, "0")
-        setattr(self, f"{oled_side}_text_y", text_y)
-        
+        state.text_y = ttk.Entry(pos_frame, width=5)
+        state.text_y.pack(side='left', padx=5)
+        state.text_y.insert(0, "0")
+
         # Rotation control
-        rot_frame = ttk.LabelFrame(controls_frame, text="Rotation", padding=5)
-        rot_frame.pack(side='left', padx=5)
-        
-        rotation_var = tk.IntVar(value=0)
-        setattr(self, f"{oled_side}_text_rotation", rotation_var)
-        for angle in [0, 45, 90, 135, 180, 225, 270, 315]:
-            ttk.Radiobutton(rot_frame, text=f"{angle}°", 
-                          variable=rotation_var, 
-                          value=angle).pack(side='left', padx=2)
+        state.text_rotation = self._make_rotation_control(controls_frame)
+        state.text_rotation.trace_add('write',
+                                     lambda *args: self._schedule_text_preview(oled_side))
         
         # Preview frame
         preview_frame = ttk.LabelFrame(parent, text="Preview", padding=10)
         preview_frame.pack(fill='both', expand=True, padx=10, pady=5)
         
-        preview_canvas = tk.Canvas(preview_frame,
-                                 width=self.oled_width * self.preview_scale,
-                                 height=self.oled_height * self.preview_scale,
-                                 bg='black')
-        preview_canvas.pack(pady=10)
-        setattr(self, f"{oled_side}_text_preview", preview_canvas)
-        
+        state.text_preview = tk.Canvas(preview_frame,
+                                     width=self.oled_width * self.preview_scale,
+                                     height=self.oled_height * self.preview_scale,
+                                     bg='black')
+        state.text_preview.pack(pady=10)
+
+        # Persistent preview image and canvas item; updates paste into the
+        # photo and Tk redraws the existing item
+        state.text_photo = ImageTk.PhotoImage(
+            Image.new('1', (self.oled_width * self.preview_scale,
+                            self.oled_height * self.preview_scale), 0))
+        state.text_preview.create_image(0, 0, anchor='nw',
+                                       image=state.text_photo)
+
+        # Preallocated draw buffer, cleared and redrawn on each preview
+        state.text_buf = Image.new('1', (self.oled_width, self.oled_height), 0)
+        state.text_draw = ImageDraw.Draw(state.text_buf)
+
         # Control buttons
         button_frame = ttk.Frame(parent)
         button_frame.pack(fill='x', padx=10, pady=5)
         
         ttk.Button(button_frame, text="Preview",
                   command=lambda: self.update_text_preview(oled_side)).pack(side='left', padx=5)
-        ttk.Button(button_frame, text="Apply to OLED",
-                  command=lambda: self.apply_text_to_oled(oled_side)).pack(side='left', padx=5)
+        apply_btn = ttk.Button(button_frame, text="Apply to OLED",
+                              command=lambda: self.apply_text_to_oled(oled_side))
+        apply_btn.pack(side='left', padx=5)
+        self.apply_buttons.append(apply_btn)
     
     def setup_image_mode(self, parent, oled_side):
+        state = self.sides[oled_side]
+
         # Image controls frame
         controls_frame = ttk.LabelFrame(parent, text="Image Controls", padding=10)
         controls_frame.pack(fill='x', padx=10, pady=5)
@@ -249,199 +360,258 @@ class OLED_Configurator:
                   command=lambda: self.select_image(oled_side)).pack(side='left', pady=5, padx=5)
         
         # Rotation control
-        rot_frame = ttk.LabelFrame(controls_frame, text="Rotation", padding=5)
-        rot_frame.pack(side='left', padx=5)
-        
-        rotation_var = tk.IntVar(value=0)
-        setattr(self, f"{oled_side}_image_rotation", rotation_var)
-        for angle in [0, 45, 90, 135, 180, 225, 270, 315]:
-            ttk.Radiobutton(rot_frame, text=f"{angle}°",
-                          variable=rotation_var,
-                          value=angle).pack(side='left', padx=2)
-        
+        state.image_rotation = self._make_rotation_control(controls_frame)
+        # Re-render the preview when the rotation changes
+        state.image_rotation.trace_add('write',
+                                      lambda *args: self.update_image_preview(oled_side))
+
         # Preview frame
         preview_frame = ttk.LabelFrame(parent, text="Preview", padding=10)
         preview_frame.pack(fill='both', expand=True, padx=10, pady=5)
-        
-        preview_canvas = tk.Canvas(preview_frame,
-                                 width=self.oled_width * self.preview_scale,
-                                 height=self.oled_height * self.preview_scale,
-                                 bg='black')
-        preview_canvas.pack(pady=10)
-        setattr(self, f"{oled_side}_image_preview", preview_canvas)
+
+        state.image_preview = tk.Canvas(preview_frame,
+                                      width=self.oled_width * self.preview_scale,
+                                      height=self.oled_height * self.preview_scale,
+                                      bg='black')
+        state.image_preview.pack(pady=10)
+
+        # Persistent preview image and canvas item, updated via paste
+        state.image_photo = ImageTk.PhotoImage(
+            Image.new('1', (self.oled_width * self.preview_scale,
+                            self.oled_height * self.preview_scale), 0))
+        state.image_preview.create_image(0, 0, anchor='nw',
+                                        image=state.image_photo)
         
         # Control buttons
         button_frame = ttk.Frame(parent)
         button_frame.pack(fill='x', padx=10, pady=5)
         
-        ttk.Button(button_frame, text="Apply to OLED",
-                  command=lambda: self.apply_image_to_oled(oled_side)).pack(side='left', padx=5)
+        apply_btn = ttk.Button(button_frame, text="Apply to OLED",
+                              command=lambda: self.apply_image_to_oled(oled_side))
+        apply_btn.pack(side='left', padx=5)
+        self.apply_buttons.append(apply_btn)
     
     def select_image(self, oled_side):
         file_path = filedialog.askopenfilename(
             filetypes=[("Image files", "*.png *.jpg *.bmp *.gif")])
         if file_path:
             try:
-                # Open and convert image
-                image = Image.open(file_path)
-                
-                # Apply rotation
-                rotation = getattr(self, f"{oled_side}_image_rotation").get()
-                if rotation:
-                    image = image.rotate(-rotation, expand=True)
-                
-                # Resize to fit OLED dimensions
-                image = image.resize((self.oled_width, self.oled_height))
-                # Convert to monochrome
-                image = image.convert('1')
-                
-                # Create preview
-                preview = image.resize((self.oled_width * self.preview_scale,
-                                     self.oled_height * self.preview_scale))
-                preview_image = ImageTk.PhotoImage(preview)
-                
-                # Store references
-                setattr(self, f"{oled_side}_preview_image", preview_image)
-                setattr(self, f"{oled_side}_current_image", image)
-                
-                # Update preview
-                preview_canvas = getattr(self, f"{oled_side}_image_preview")
-                preview_canvas.create_image(0, 0, anchor='nw', 
-                                         image=preview_image)
-                
+                # Keep the source around so rotation changes can re-render
+                state = self.sides[oled_side]
+                state.source_image = Image.open(file_path)
+
+                # Invalidate cached renders of the previous source
+                state.rot_cache.clear()
+
+                self.update_image_preview(oled_side)
+
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load image: {str(e)}")
+
+    def update_image_preview(self, oled_side):
+        state = self.sides[oled_side]
+        if state.source_image is None:
+            return
+
+        rotation = state.image_rotation.get()
+
+        # Rotating, resizing, and dithering are the expensive steps;
+        # reuse the render when this rotation was done before
+        image = state.rot_cache.get(rotation)
+        if image is None:
+            image = state.source_image
+
+            # Apply rotation (skipped for full turns; copy so thumbnail
+            # below never mutates the stored source)
+            if rotation % 360:
+                image = image.rotate(-rotation, expand=True,
+                                     resample=Image.BILINEAR)
+            else:
+                image = image.copy()
+
+            # Large sources dominate the render; thumbnail drops them to
+            # 2x the target cheaply before the final high-quality resize
+            image.thumbnail((self.oled_width * 2, self.oled_height * 2),
+                            Image.LANCZOS)
+            image = image.resize((self.oled_width, self.oled_height),
+                                 Image.LANCZOS)
+
+            # Convert to monochrome; dithering only helps grayscale sources
+            dither = (Image.NONE if state.source_image.mode == '1'
+                      else Image.FLOYDSTEINBERG)
+            image = image.convert('1', dither=dither)
+            state.rot_cache[rotation] = image
+
+        # Create preview; nearest keeps pixels pure black/white
+        preview = image.resize((self.oled_width * self.preview_scale,
+                             self.oled_height * self.preview_scale),
+                            Image.NEAREST)
+
+        # Update the persistent PhotoImage in place
+        state.image_photo.paste(preview)
+        state.current_image = image
     
+    def _schedule_text_preview(self, oled_side):
+        """Debounce preview renders so rapid edits only draw once."""
+        pending = self._preview_pending.get(oled_side)
+        if pending is not None:
+            self.root.after_cancel(pending)
+        self._preview_pending[oled_side] = self.root.after(
+            50, lambda: self.update_text_preview(oled_side))
+
     def update_text_preview(self, oled_side):
-        # Create a new image for preview
-        image = Image.new('1', (self.oled_width, self.oled_height), 0)
-        draw = ImageDraw.Draw(image)
-        
+        # Reuse this side's preallocated draw buffer
+        state = self.sides[oled_side]
+        image = state.text_buf
+
         try:
-            x = int(getattr(self, f"{oled_side}_text_x").get())
-            y = int(getattr(self, f"{oled_side}_text_y").get())
-            text = getattr(self, f"{oled_side}_text_var").get()
-            rotation = getattr(self, f"{oled_side}_text_rotation").get()
-            
-            # Create rotated text image
+            x = int(state.text_x.get())
+            y = int(state.text_y.get())
+            text = state.text_var.get()
+            rotation = state.text_rotation.get()
+
+            # Skip the redraw entirely when nothing changed
+            key = (text, x, y, rotation)
+            if state.text_cache_key == key:
+                return
+
+            # Clear the buffer and redraw the text
+            state.text_draw.rectangle([(0, 0), (self.oled_width, self.oled_height)], fill=0)
+            state.text_draw.text((x, y), text, fill=1, font=self.text_font)
             if rotation:
-                # Create a temporary image for rotation
-                temp_img = Image.new('1', (self.oled_width, self.oled_height), 0)
-                temp_draw = ImageDraw.Draw(temp_img)
-                temp_draw.text((x, y), text, fill=1)
-                # Rotate the image
-                image = temp_img.rotate(-rotation, expand=False)
-            else:
-                draw.text((x, y), text, fill=1)
-            
-            # Scale up for preview
+                image = image.rotate(-rotation, expand=False)
+
+            # Scale up for preview; nearest keeps pixels pure black/white
             preview = image.resize((self.oled_width * self.preview_scale,
-                                 self.oled_height * self.preview_scale))
-            preview_image = ImageTk.PhotoImage(preview)
-            
-            # Store references
-            setattr(self, f"{oled_side}_preview_text_image", preview_image)
-            setattr(self, f"{oled_side}_current_text_image", image)
-            
-            # Update preview
-            preview_canvas = getattr(self, f"{oled_side}_text_preview")
-            preview_canvas.create_image(0, 0, anchor='nw',
-                                     image=preview_image)
-            
+                                 self.oled_height * self.preview_scale),
+                                Image.NEAREST)
+
+            # Update the persistent PhotoImage in place
+            state.text_photo.paste(preview)
+
+            state.current_text_image = image
+            state.text_cache_key = key
+
         except ValueError:
             messagebox.showerror("Error", "Invalid X/Y coordinates")
     
     def send_to_oled(self, image_data, oled_side):
+        """Send an image to one OLED. Runs on a worker thread; raises on failure."""
         if not self.device:
-            messagebox.showerror("Error", "Not connected to Lily58")
-            return False
-        
-        try:
-            # Convert image data to bytes
-            pixels = list(image_data.getdata())
-            bytes_data = []
-            for i in range(0, len(pixels), 8):
-                byte = 0
-                for bit in range(8):
-                    if i + bit < len(pixels):
-                        byte |= (pixels[i + bit] > 0) << (7 - bit)
-                bytes_data.append(byte)
+            raise RuntimeError("Not connected to Lily58")
+
+        with self.device_lock:
+            # PIL '1' mode already stores pixels packed MSB-first, which
+            # matches the wire format, so the raw buffer can be sent as-is
+            bytes_data = image_data.tobytes()
             
             # Send data in chunks with VIA protocol
-            chunk_size = 28  # 32 - 4 bytes for header
+            chunk_size = self.chunk_size
             total_chunks = (len(bytes_data) + chunk_size - 1) // chunk_size
-            
+
+            # Pipeline writes: keep up to ack_window chunks in flight and
+            # drain acknowledgments as we go, instead of a full write/read
+            # round trip per chunk.
+            ack_window = 4
+            outstanding = deque()
+
+            # One reusable report buffer; only the chunk index and payload
+            # change between writes
+            side_byte = 0x01 if oled_side == "left" else 0x02
+            buf = bytearray(self.report_size)
+            buf[0] = 0x00  # Report ID
+            buf[1] = VIA_COMMAND_OLED  # OLED command
+            buf[2] = side_byte  # OLED selection
+
+            # Hoist the method lookups out of the hot loop
+            write = self.device.write
+            read = self.read_with_timeout
+
             for chunk_index in range(total_chunks):
                 start_idx = chunk_index * chunk_size
                 end_idx = min(start_idx + chunk_size, len(bytes_data))
                 chunk = bytes_data[start_idx:end_idx]
-                
-                # Prepare VIA command
-                command = [
-                    0x00,  # Report ID
-                    VIA_COMMAND_OLED,  # OLED command
-                    0x01 if oled_side == "left" else 0x02,  # OLED selection
-                    chunk_index,  # Chunk index
-                ]
-                
-                # Add chunk data
-                command.extend(chunk)
-                
-                # Pad to 32 bytes
-                while len(command) < 32:
-                    command.append(0)
-                
+
+                # Fill in chunk index and payload, zero-padding the tail
+                buf[3] = chunk_index
+                buf[4:4 + len(chunk)] = chunk
+                buf[4 + len(chunk):] = b'\x00' * (chunk_size - len(chunk))
+
                 # Send command
-                debug_print(f"Sending chunk {chunk_index}: {command}")
-                self.device.write(bytes(command))
-                
-                # Wait for acknowledgment
-                response = self.read_with_timeout(timeout=0.5)
+                if DEBUG:
+                    debug_print(f"Sending chunk {chunk_index}: {list(buf)}")
+                write(bytes(buf))
+                outstanding.append(chunk_index)
+
+                # Drain one acknowledgment once the window is full
+                if len(outstanding) >= ack_window:
+                    acked_index = outstanding.popleft()
+                    response = read(timeout=0.5)
+                    if not response:
+                        raise TimeoutError(f"Device did not acknowledge chunk {acked_index}")
+                    if DEBUG:
+                        debug_print(f"Chunk {acked_index} acknowledged: {response}")
+
+            # Drain remaining acknowledgments before the completion command
+            while outstanding:
+                acked_index = outstanding.popleft()
+                response = read(timeout=0.5)
                 if not response:
-                    raise TimeoutError(f"Device did not acknowledge chunk {chunk_index}")
-                debug_print(f"Chunk {chunk_index} acknowledged: {response}")
-                
-                # Small delay between chunks
-                time.sleep(0.01)
-            
-            # Send completion command
-            completion_command = [
-                0x00,  # Report ID
-                VIA_COMMAND_OLED,  # OLED command
-                0x01 if oled_side == "left" else 0x02,  # OLED selection
-                0xFF,  # Completion marker
-            ]
-            completion_command.extend([0] * 28)  # Pad to 32 bytes
-            
-            debug_print(f"Sending completion command: {completion_command}")
-            self.device.write(bytes(completion_command))
-            
-            # Wait for final acknowledgment
-            response = self.read_with_timeout(timeout=0.5)
-            if not response:
-                raise TimeoutError("Device did not acknowledge completion")
-            debug_print(f"Completion acknowledged: {response}")
+                    raise TimeoutError(f"Device did not acknowledge chunk {acked_index}")
+                if DEBUG:
+                    debug_print(f"Chunk {acked_index} acknowledged: {response}")
             
+            # Send completion command; struct.pack emits the zero-padded
+            # report in a single C-level allocation. All data chunks have
+            # been acknowledged at this point, so the completion frame is
+            # fire-and-forget: skipping its ACK saves one USB round trip.
+            completion_command = struct.pack(f'<4B{self.report_size - 4}x',
+                                             0x00, VIA_COMMAND_OLED, side_byte, 0xFF)
+            if DEBUG:
+                debug_print(f"Sending completion command: {list(completion_command)}")
+            write(completion_command)
+
             return True
-            
+
+    def _start_send(self, image_data, oled_side, content_name):
+        """Run send_to_oled on a worker thread so the GUI stays responsive."""
+        for button in self.apply_buttons:
+            button.state(['disabled'])
+        threading.Thread(target=self._send_worker,
+                         args=(image_data, oled_side, content_name),
+                         daemon=True).start()
+
+    def _send_worker(self, image_data, oled_side, content_name):
+        try:
+            self.send_to_oled(image_data, oled_side)
         except TimeoutError as e:
-            messagebox.showerror("Error", str(e))
-            return False
+            error_msg = str(e)
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to send to OLED: {str(e)}")
-            return False
-    
+            error_msg = f"Failed to send to OLED: {str(e)}"
+        else:
+            error_msg = None
+        # Marshal UI updates back to the Tk main thread
+        self.root.after(0, self._send_finished, oled_side, content_name, error_msg)
+
+    def _send_finished(self, oled_side, content_name, error_msg):
+        for button in self.apply_buttons:
+            button.state(['!disabled'])
+        if error_msg:
+            messagebox.showerror("Error", error_msg)
+        else:
+            messagebox.showinfo("Success", f"{content_name} sent to {oled_side} OLED")
+
     def apply_text_to_oled(self, oled_side):
-        if hasattr(self, f"{oled_side}_current_text_image"):
-            if self.send_to_oled(getattr(self, f"{oled_side}_current_text_image"), oled_side):
-                messagebox.showinfo("Success", f"Text sent to {oled_side} OLED")
+        state = self.sides[oled_side]
+        if state.current_text_image is not None:
+            self._start_send(state.current_text_image, oled_side, "Text")
         else:
             messagebox.showwarning("Warning", "Please preview text first")
-    
+
     def apply_image_to_oled(self, oled_side):
-        if hasattr(self, f"{oled_side}_current_image"):
-            if self.send_to_oled(getattr(self, f"{oled_side}_current_image"), oled_side):
-                messagebox.showinfo("Success", f"Image sent to {oled_side} OLED")
+        state = self.sides[oled_side]
+        if state.current_image is not None:
+            self._start_send(state.current_image, oled_side, "Image")
         else:
             messagebox.showwarning("Warning", "Please select an image first")
     